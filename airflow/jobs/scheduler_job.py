@@ -185,6 +185,8 @@ class DagFileProcessorProcess(AbstractDagFileProcessorProcess, LoggingMixin, Mul
             # We re-initialized the ORM within this Process above so we need to
             # tear it down manually here
             settings.dispose_orm()
+            # The process exits with os._exit, which skips the exit handlers sending the buffered stats
+            Stats.flush()
 
     def start(self) -> None:
         """
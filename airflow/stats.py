@@ -16,12 +16,21 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import atexit
+import inspect
 import logging
+import os
+import re
 import socket
 import string
 import textwrap
-from functools import wraps
-from typing import TYPE_CHECKING, Callable, Optional, TypeVar, cast
+import threading
+import time
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_right
+from collections import defaultdict, deque
+from functools import lru_cache, wraps
+from typing import TYPE_CHECKING, Callable, DefaultDict, Deque, Dict, List, Optional, Tuple, TypeVar, cast
 
 from airflow.configuration import conf
 from airflow.exceptions import AirflowConfigException, InvalidStatsNameException
@@ -48,6 +57,10 @@ class StatsLogger(Protocol):
     def timing(cls, stat: str, dt) -> None:
         """Stats timing"""
 
+    @classmethod
+    def flush(cls) -> None:
+        """Send the buffered stats"""
+
 
 class DummyStatsLogger:
     """If no StatsLogger is configured, DummyStatsLogger is used as a fallback"""
@@ -67,10 +80,24 @@ class DummyStatsLogger:
     def timing(cls, stat, dt):
         """Stats timing"""
 
+    @classmethod
+    def flush(cls):
+        """Send the buffered stats"""
+
 
 # Only characters in the character set are considered valid
 # for the stat_name if stat_name_default_handler is used.
 ALLOWED_CHARACTERS = set(string.ascii_letters + string.digits + '_.-')
+# Matches any character outside of ALLOWED_CHARACTERS, so the check runs in a single C-level scan
+_DISALLOWED_CHARACTERS_RE = re.compile('[^{}]'.format(re.escape(''.join(sorted(ALLOWED_CHARACTERS)))))
+
+_STAT_NAME_TOO_LONG_ERROR = textwrap.dedent("""\
+    The stat_name (%s) has to be less than %d characters.
+    """)
+_STAT_NAME_INVALID_CHARACTERS_ERROR = textwrap.dedent("""\
+    The stat name (%s) has to be composed with characters in
+    {allowed_characters}.
+    """).format(allowed_characters=ALLOWED_CHARACTERS)
 
 
 def stat_name_default_handler(stat_name, max_length=250) -> str:
@@ -80,148 +107,518 @@ def stat_name_default_handler(stat_name, max_length=250) -> str:
     if not isinstance(stat_name, str):
         raise InvalidStatsNameException('The stat_name has to be a string')
     if len(stat_name) > max_length:
-        raise InvalidStatsNameException(textwrap.dedent("""\
-            The stat_name ({stat_name}) has to be less than {max_length} characters.
-        """.format(stat_name=stat_name, max_length=max_length)))
-    if not all((c in ALLOWED_CHARACTERS) for c in stat_name):
-        raise InvalidStatsNameException(textwrap.dedent("""\
-            The stat name ({stat_name}) has to be composed with characters in
-            {allowed_characters}.
-            """.format(stat_name=stat_name,
-                       allowed_characters=ALLOWED_CHARACTERS)))
+        raise InvalidStatsNameException(_STAT_NAME_TOO_LONG_ERROR % (stat_name, max_length))
+    if _DISALLOWED_CHARACTERS_RE.search(stat_name):
+        raise InvalidStatsNameException(_STAT_NAME_INVALID_CHARACTERS_ERROR % (stat_name,))
     return stat_name
 
 
+@lru_cache(maxsize=1)
 def get_current_handler_stat_name_func() -> Callable[[str], str]:
-    """Get Stat Name Handler from airflow.cfg"""
+    """Get Stat Name Handler from airflow.cfg
+
+    The stats loggers resolve the handler when they are created, rather than for every emitted stat.
+    The handler is cached, call ``get_current_handler_stat_name_func.cache_clear()`` to pick up
+    config changes.
+    """
     return conf.getimport('scheduler', 'stat_name_handler') or stat_name_default_handler
 
 
 T = TypeVar("T", bound=Callable)  # pylint: disable=invalid-name
 
 
+# Bounds the stat names cached by each stats logger, in case stat names are built from unbounded values
+MAX_CACHED_STAT_NAMES = 10000
+
+# Marks the stats missing from the cache of a stats logger, as None marks the stats not to emit
+_UNRESOLVED = object()
+
+
 def validate_stat(fn: T) -> T:
-    """Check if stat name contains invalid characters.
+    """Check if stat name contains invalid characters and if it is in the allow list.
     Log and not emit stats if name is invalid
+
+    The outcome of both checks only depends on the stat name, so it is cached by the stats logger
+    and the checks run once per stat name.
     """
     @wraps(fn)
     def wrapper(_self, stat, *args, **kwargs):
         try:
-            handler_stat_name_func = get_current_handler_stat_name_func()
-            stat_name = handler_stat_name_func(stat)
-            return fn(_self, stat_name, *args, **kwargs)
-        except InvalidStatsNameException:
-            log.error('Invalid stat name: %s.', stat, exc_info=True)
+            stat_name = _self._stat_names.get(stat, _UNRESOLVED)  # pylint: disable=protected-access
+        except TypeError:
+            stat_name = _UNRESOLVED  # unhashable stat
+        # Resolved outside of the except clause, so that the errors it logs are not chained
+        if stat_name is _UNRESOLVED:
+            stat_name = _resolve_stat_name(_self, stat)
+        if stat_name is None:
             return None
+        return fn(_self, stat_name, *args, **kwargs)
 
     return cast(T, wrapper)
 
 
+def _resolve_stat_name(stats_logger, stat) -> Optional[str]:
+    """Returns the name to emit the stat with, or None if the stat must not be emitted"""
+    stat_name: Optional[str]
+    try:
+        stat_name = stats_logger.stat_name_handler(stat)
+    except InvalidStatsNameException:
+        log.error('Invalid stat name: %s.', stat, exc_info=True)
+        stat_name = None
+    if stat_name is not None and not stats_logger.allow_list_validator.test(stat_name):
+        stat_name = None
+
+    stat_names = stats_logger._stat_names  # pylint: disable=protected-access
+    if len(stat_names) >= MAX_CACHED_STAT_NAMES:
+        stat_names.clear()
+    try:
+        stat_names[stat] = stat_name
+    except TypeError:
+        pass  # unhashable stat, which is always invalid
+    return stat_name
+
+
 class AllowListValidator:
     """Class to filter unwanted stats"""
 
     def __init__(self, allow_list=None):
         if allow_list:
             self.allow_list = tuple([item.strip().lower() for item in allow_list.split(',')])
+            # Sorted prefixes, without the ones starting with another prefix. This way the only
+            # prefix a stat can start with is the last one sorted before it, found by bisection.
+            self._sorted_prefixes: List[str] = []
+            for prefix in sorted(self.allow_list):
+                if not self._sorted_prefixes or not prefix.startswith(self._sorted_prefixes[-1]):
+                    self._sorted_prefixes.append(prefix)
         else:
             self.allow_list = None
 
+    def _starts_with_prefix(self, stat):
+        index = bisect_right(self._sorted_prefixes, stat) - 1
+        return index >= 0 and stat.startswith(self._sorted_prefixes[index])
+
     def test(self, stat):
         """Test if stat is in the Allow List"""
-        if self.allow_list is not None:
-            return stat.strip().lower().startswith(self.allow_list)
-        else:
+        if self.allow_list is None:
             return True  # default is all metrics allowed
+        if self._starts_with_prefix(stat):
+            return True
+        # The prefixes are lowercase, so a lowercase stat cannot match in another case
+        return not stat.islower() and self._starts_with_prefix(stat.lower())
+
+
+class BackgroundFlushStatsClient(metaclass=ABCMeta):
+    """
+    Base class for the statsd client wrappers that buffer stats in process and send them to
+    the wrapped client from a background thread every ``flush_interval`` seconds.
+    """
+
+    def __init__(self, statsd_client, flush_interval: float = 1.0):
+        self.statsd = statsd_client
+        self.flush_interval = flush_interval
+        self._closed = False
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._start_flusher()
+        if hasattr(os, 'register_at_fork'):
+            # Threads do not survive a fork, so forked processes need their own flusher
+            os.register_at_fork(after_in_child=self._after_fork)  # pylint: disable=no-member
+        atexit.register(self.close)
+
+    def _after_fork(self):
+        # The fork hook cannot be unregistered, so a closed client must not start a flusher again
+        if self._closed:
+            return
+        # The locks may have been held by threads that do not exist in the child process
+        self._wakeup = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._reset_buffers()
+        self._start_flusher()
+
+    def _reset_buffers(self):
+        """Drops the stats buffered before a fork, the parent process sends them"""
+
+    def _start_flusher(self):
+        threading.Thread(target=self._flush_periodically, name="statsd-flusher", daemon=True).start()
+
+    def _flush_periodically(self):
+        while not self._closed:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-except
+                # Keep the thread running, or no stat would ever be sent again
+                log.exception("Could not send the buffered stats")
+
+    @abstractmethod
+    def flush(self):
+        """Send the buffered stats, called every ``flush_interval`` seconds"""
+
+    def flush_buffers(self):
+        """Send all buffered stats"""
+        self.flush()
+
+    def close(self):
+        """Stop the flusher thread and send the remaining stats"""
+        self._closed = True
+        self._wakeup.set()
+        self.flush_buffers()
+
+
+class BatchingStatsClient(BackgroundFlushStatsClient):
+    """Statsd client wrapper sending the queued stats in batches from a background thread"""
+
+    def __init__(
+        self,
+        statsd_client,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10000,
+        report_dropped: bool = True,
+    ):
+        self.max_queue_size = max_queue_size
+        # Whether the dropped stats are counted in the stats.dropped stat, which the allow list may exclude
+        self.report_dropped = report_dropped
+        self._queue: Deque[Tuple] = deque(maxlen=max_queue_size)
+        self._dropped = 0
+        super().__init__(statsd_client, flush_interval)
+
+    def _reset_buffers(self):
+        self._queue.clear()
+        self._dropped = 0
+
+    def _put(self, item):
+        # Appending to the bounded deque never blocks, the oldest stats are dropped when it is full
+        queue = self._queue
+        if len(queue) >= self.max_queue_size // 2:
+            if len(queue) == self.max_queue_size:
+                self._dropped += 1
+            # Setting the event takes its lock, so only do it once until the flusher wakes up
+            if not self._wakeup.is_set():
+                self._wakeup.set()
+        queue.append(item)
+
+    def flush(self):
+        """Send all queued stats"""
+        with self._flush_lock:
+            pipeline = self.statsd.pipeline()
+            dropped, self._dropped = self._dropped, 0
+            if dropped and self.report_dropped:
+                pipeline.incr('stats.dropped', dropped)
+            queue = self._queue
+            # Only drain what is queued now, so that busy producers cannot keep the flush going
+            for _ in range(len(queue)):
+                method, args = queue.popleft()
+                getattr(pipeline, method)(*args)
+            pipeline.send()
+
+    def incr(self, stat, count=1, rate=1):
+        """Increment stat"""
+        self._put(('incr', (stat, count, rate)))
+
+    def decr(self, stat, count=1, rate=1):
+        """Decrement stat"""
+        self._put(('decr', (stat, count, rate)))
+
+    def gauge(self, stat, value, rate=1, delta=False):
+        """Gauge stat"""
+        self._put(('gauge', (stat, value, rate, delta)))
+
+    def timing(self, stat, dt, rate=1):
+        """Stats timing"""
+        self._put(('timing', (stat, dt, rate)))
+
+
+class _CounterShard:
+    """Counters of a single thread, updated without any lock"""
+
+    def __init__(self):
+        self.counters: DefaultDict[str, int] = defaultdict(int)
+        self.retired: DefaultDict[str, int] = defaultdict(int)
+        self.detached = False
+
+
+class AggregatingStatsClient(BackgroundFlushStatsClient):
+    """Statsd client wrapper summing up counters and gauges in process until the next flush.
+    Sampled stats and timings are sent as they come through ``passthrough_client``.
+    """
+
+    def __init__(self, statsd_client, flush_interval: float = 1.0, passthrough_client=None):
+        self.passthrough = passthrough_client or statsd_client
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: List[_CounterShard] = []
+        self._detached_shards: List[_CounterShard] = []
+        self._gauges: Dict[str, float] = {}
+        self._gauge_deltas: DefaultDict[str, float] = defaultdict(float)
+        super().__init__(statsd_client, flush_interval)
+
+    def _reset_buffers(self):
+        self._lock = threading.Lock()
+        # Forget the shard of the forking thread too, its counters are sent by the parent process
+        self._local = threading.local()
+        self._shards = []
+        self._detached_shards = []
+        self._gauges = {}
+        self._gauge_deltas = defaultdict(float)
+
+    def _get_counters(self) -> DefaultDict[str, int]:
+        # Each thread counts in its own shard, so counting takes no lock. Threads whose shard
+        # was detached by a flush get a new one.
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = None
+        if shard is None or shard.detached:
+            shard = self._local.shard = _CounterShard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard.counters
+
+    def flush(self):
+        """Send the aggregated stats"""
+        with self._flush_lock:
+            with self._lock:
+                shards = list(self._shards)
+                gauges, self._gauges = self._gauges, {}
+                gauge_deltas, self._gauge_deltas = self._gauge_deltas, defaultdict(float)
+            counters: DefaultDict[str, int] = defaultdict(int)
+            # A thread may still be updating the counters it was given before the swap below, so
+            # the counters swapped out are only sent by the next flush, once nothing updates them.
+            # Nothing updates the shards detached by the previous flush anymore, so send them all
+            for shard in self._detached_shards:
+                for shard_counters in (shard.retired, shard.counters):
+                    for stat, count in shard_counters.items():
+                        counters[stat] += count
+            self._detached_shards = []
+            for shard in shards:
+                retired = shard.retired
+                shard.retired, shard.counters = shard.counters, defaultdict(int)
+                for stat, count in retired.items():
+                    counters[stat] += count
+                # Shards unused for a whole flush interval are detached, so that the shards of exited
+                # threads do not pile up. Thread liveness is not used, as threads not started by the
+                # threading module, like gevent greenlets, never appear to exit.
+                if not retired and not shard.retired:
+                    shard.detached = True
+                    self._detached_shards.append(shard)
+                    with self._lock:
+                        self._shards.remove(shard)
+            for stat, count in counters.items():
+                self.statsd.incr(stat, count)
+            for stat, value in gauges.items():
+                self.statsd.gauge(stat, value)
+            for stat, value in gauge_deltas.items():
+                self.statsd.gauge(stat, value, delta=True)
+
+    def flush_buffers(self):
+        """Send all buffered stats"""
+        # The first flush only swaps the latest counters out
+        self.flush()
+        self.flush()
+
+    def incr(self, stat, count=1, rate=1):
+        """Increment stat"""
+        if rate != 1:
+            return self.passthrough.incr(stat, count, rate)
+        self._get_counters()[stat] += count
+        return None
+
+    def decr(self, stat, count=1, rate=1):
+        """Decrement stat"""
+        if rate != 1:
+            return self.passthrough.decr(stat, count, rate)
+        self._get_counters()[stat] -= count
+        return None
+
+    def gauge(self, stat, value, rate=1, delta=False):
+        """Gauge stat"""
+        if rate != 1:
+            return self.passthrough.gauge(stat, value, rate, delta)
+        with self._lock:
+            if not delta:
+                self._gauges[stat] = value
+                self._gauge_deltas.pop(stat, None)
+            elif stat in self._gauges:
+                self._gauges[stat] += value
+            else:
+                self._gauge_deltas[stat] += value
+        return None
+
+    def timing(self, stat, dt):
+        """Stats timing"""
+        return self.passthrough.timing(stat, dt)
+
+
+class _StatWindow:
+    """Emissions of a stat during the current second and the previous one"""
+
+    __slots__ = ('start', 'emitted', 'previous')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.emitted = 0
+        self.previous = 0
+
+
+class RateLimitedStatsClient:
+    """Statsd client wrapper sampling the stats emitted more than ``max_rate`` times per second"""
+
+    def __init__(self, statsd_client, max_rate: float):
+        self.statsd = statsd_client
+        self.max_rate = max_rate
+        self._windows: Dict[str, _StatWindow] = {}
+
+    def _get_sample_rate(self, stat) -> float:
+        now = time.monotonic()
+        window = self._windows.get(stat)
+        if window is None:
+            if len(self._windows) >= MAX_CACHED_STAT_NAMES:
+                self._windows.clear()
+            window = self._windows[stat] = _StatWindow(now)
+        elif now - window.start >= 1:
+            # A stat not emitted during the previous second is only sampled from its current emissions
+            window.previous = window.emitted if now - window.start < 2 else 0
+            window.start = now
+            window.emitted = 0
+        window.emitted += 1
+        # The emissions of the previous second sample a steady stat from the start of the second, the
+        # ones of the current second sample bursts. Each stat is sent with its own sample rate, so
+        # the counters scaled back up by the statsd server stay accurate.
+        emitted = max(window.emitted, window.previous)
+        if emitted <= self.max_rate:
+            return 1.0
+        return self.max_rate / emitted
+
+    def incr(self, stat, count=1, rate=1):
+        """Increment stat"""
+        return self.statsd.incr(stat, count, rate * self._get_sample_rate(stat))
+
+    def decr(self, stat, count=1, rate=1):
+        """Decrement stat"""
+        return self.statsd.decr(stat, count, rate * self._get_sample_rate(stat))
+
+    def gauge(self, stat, value, rate=1, delta=False):
+        """Gauge stat"""
+        # Statsd servers do not scale sampled gauge deltas back up
+        if delta:
+            return self.statsd.gauge(stat, value, rate, delta)
+        return self.statsd.gauge(stat, value, rate * self._get_sample_rate(stat), delta)
+
+    def timing(self, stat, dt):
+        """Stats timing"""
+        sample_rate = self._get_sample_rate(stat)
+        if sample_rate < 1:
+            return self.statsd.timing(stat, dt, sample_rate)
+        return self.statsd.timing(stat, dt)
 
 
 class SafeStatsdLogger:
     """Statsd Logger"""
 
-    def __init__(self, statsd_client, allow_list_validator=AllowListValidator()):
+    def __init__(
+        self,
+        statsd_client,
+        allow_list_validator=AllowListValidator(),
+        stat_name_handler=None,
+        buffered_clients: Optional[List[BackgroundFlushStatsClient]] = None,
+    ):
         self.statsd = statsd_client
         self.allow_list_validator = allow_list_validator
+        self.stat_name_handler = stat_name_handler or get_current_handler_stat_name_func()
+        # Flushed in order, so a client must come before the clients it sends its stats to
+        self.buffered_clients = buffered_clients or []
+        self._stat_names: Dict[str, Optional[str]] = {}
 
     @validate_stat
     def incr(self, stat, count=1, rate=1):
         """Increment stat"""
-        if self.allow_list_validator.test(stat):
-            return self.statsd.incr(stat, count, rate)
-        return None
+        return self.statsd.incr(stat, count, rate)
 
     @validate_stat
     def decr(self, stat, count=1, rate=1):
         """Decrement stat"""
-        if self.allow_list_validator.test(stat):
-            return self.statsd.decr(stat, count, rate)
-        return None
+        return self.statsd.decr(stat, count, rate)
 
     @validate_stat
     def gauge(self, stat, value, rate=1, delta=False):
         """Gauge stat"""
-        if self.allow_list_validator.test(stat):
-            return self.statsd.gauge(stat, value, rate, delta)
-        return None
+        return self.statsd.gauge(stat, value, rate, delta)
 
     @validate_stat
     def timing(self, stat, dt):
         """Stats timing"""
-        if self.allow_list_validator.test(stat):
-            return self.statsd.timing(stat, dt)
-        return None
+        return self.statsd.timing(stat, dt)
+
+    def flush(self):
+        """Send the buffered stats, before exiting a process without running the exit handlers"""
+        for client in self.buffered_clients:
+            client.flush_buffers()
 
 
 class SafeDogStatsdLogger:
     """DogStatsd Logger"""
 
-    def __init__(self, dogstatsd_client, allow_list_validator=AllowListValidator()):
+    def __init__(self, dogstatsd_client, allow_list_validator=AllowListValidator(), stat_name_handler=None):
         self.dogstatsd = dogstatsd_client
         self.allow_list_validator = allow_list_validator
+        self.stat_name_handler = stat_name_handler or get_current_handler_stat_name_func()
+        self._stat_names: Dict[str, Optional[str]] = {}
+        # Bound once and called with positional arguments: (metric, value, tags, sample_rate)
+        self._increment = dogstatsd_client.increment
+        self._decrement = dogstatsd_client.decrement
+        self._gauge = dogstatsd_client.gauge
+        self._timing = dogstatsd_client.timing
+
+    def set_client(self, dogstatsd_client):
+        """Send the stats with another DogStatsd client"""
+        self.dogstatsd = dogstatsd_client
+        self._increment = dogstatsd_client.increment
+        self._decrement = dogstatsd_client.decrement
+        self._gauge = dogstatsd_client.gauge
+        self._timing = dogstatsd_client.timing
 
     @validate_stat
     def incr(self, stat, count=1, rate=1, tags=None):
         """Increment stat"""
-        if self.allow_list_validator.test(stat):
-            tags = tags or []
-            return self.dogstatsd.increment(metric=stat, value=count, tags=tags, sample_rate=rate)
-        return None
+        return self._increment(stat, count, tags, rate)
 
     @validate_stat
     def decr(self, stat, count=1, rate=1, tags=None):
         """Decrement stat"""
-        if self.allow_list_validator.test(stat):
-            tags = tags or []
-            return self.dogstatsd.decrement(metric=stat, value=count, tags=tags, sample_rate=rate)
-        return None
+        return self._decrement(stat, count, tags, rate)
 
     @validate_stat
     def gauge(self, stat, value, rate=1, delta=False, tags=None):  # pylint: disable=unused-argument
         """Gauge stat"""
-        if self.allow_list_validator.test(stat):
-            tags = tags or []
-            return self.dogstatsd.gauge(metric=stat, value=value, tags=tags, sample_rate=rate)
-        return None
+        return self._gauge(stat, value, tags, rate)
 
     @validate_stat
     def timing(self, stat, dt, tags=None):
         """Stats timing"""
-        if self.allow_list_validator.test(stat):
-            tags = tags or []
-            return self.dogstatsd.timing(metric=stat, value=dt, tags=tags)
-        return None
+        return self._timing(stat, dt, tags)
+
+    def flush(self):
+        """Send the buffered stats, before exiting a process without running the exit handlers"""
+        # DogStatsd only buffers the stats, and has a flush method, since datadog 0.43.0
+        if hasattr(self.dogstatsd, 'flush'):
+            self.dogstatsd.flush()
 
 
 class _Stats(type):
     instance: Optional[StatsLogger] = None
 
     def __getattr__(cls, name):
-        return getattr(cls.instance, name)
+        attr = getattr(cls.instance, name)
+        # Store the attribute on the class, so that further lookups skip __getattr__
+        setattr(cls, name, attr)
+        return attr
 
     def __init__(cls, *args, **kwargs):
         super().__init__(cls)
         if cls.__class__.instance is None:
             try:
-                is_datadog_enabled_defined = conf.has_option('scheduler', 'statsd_datadog_enabled')
-                if is_datadog_enabled_defined and conf.getboolean('scheduler', 'statsd_datadog_enabled'):
+                if conf.getboolean('scheduler', 'statsd_datadog_enabled', fallback=False):
                     cls.__class__.instance = cls.get_dogstatsd_logger()
                 elif conf.getboolean('scheduler', 'statsd_on'):
                     cls.__class__.instance = cls.get_statsd_logger()
@@ -238,6 +635,16 @@ class _Stats(type):
         # and previously it would crash with None is callable if it was called without it.
         from statsd import StatsClient
 
+        host = conf.get('scheduler', 'statsd_host')
+        port = conf.getint('scheduler', 'statsd_port')
+        prefix = conf.get('scheduler', 'statsd_prefix')
+        socket_path = conf.get('scheduler', 'statsd_socket_path', fallback=None)
+        batching_enabled = conf.getboolean('scheduler', 'statsd_batching_enabled', fallback=False)
+        aggregation_enabled = conf.getboolean('scheduler', 'statsd_aggregation_enabled', fallback=False)
+        # The flush interval is only used, and so only validated, when stats are buffered
+        flush_interval = cls.get_flush_interval() if batching_enabled or aggregation_enabled else None
+        rate_limit = conf.getfloat('scheduler', 'statsd_rate_limit', fallback=0)
+
         if conf.has_option('scheduler', 'statsd_custom_client_path'):
             stats_class = conf.getimport('scheduler', 'statsd_custom_client_path')
 
@@ -249,28 +656,91 @@ class _Stats(type):
             else:
                 log.info("Successfully loaded custom Statsd client")
 
-        else:
-            stats_class = StatsClient
+            if socket_path:
+                log.warning("Custom Statsd clients do not support Unix sockets, using host and port instead.")
+            statsd = stats_class(host=host, port=port, prefix=prefix)
+        elif socket_path:
+            from airflow.utils.statsd_unix_socket import UnixDatagramStatsClient
 
-        statsd = stats_class(
-            host=conf.get('scheduler', 'statsd_host'),
-            port=conf.getint('scheduler', 'statsd_port'),
-            prefix=conf.get('scheduler', 'statsd_prefix'))
+            statsd = UnixDatagramStatsClient(socket_path=socket_path, prefix=prefix)
+        else:
+            statsd = StatsClient(host=host, port=port, prefix=prefix)
         allow_list_validator = AllowListValidator(conf.get('scheduler', 'statsd_allow_list', fallback=None))
-        return SafeStatsdLogger(statsd, allow_list_validator)
+        buffered_clients: List[BackgroundFlushStatsClient] = []
+        if batching_enabled:
+            statsd = BatchingStatsClient(
+                statsd,
+                flush_interval=flush_interval,
+                report_dropped=allow_list_validator.test('stats.dropped'),
+            )
+            buffered_clients.append(statsd)
+        rate_limited_statsd = statsd
+        if rate_limit > 0:
+            rate_limited_statsd = RateLimitedStatsClient(statsd, max_rate=rate_limit)
+        if aggregation_enabled:
+            # The aggregated stats are sent once per flush, so only the stats passed through are limited
+            statsd = AggregatingStatsClient(
+                statsd, flush_interval=flush_interval, passthrough_client=rate_limited_statsd
+            )
+            # Flushed first, as it sends the aggregated stats to the batching client
+            buffered_clients.insert(0, statsd)
+        else:
+            statsd = rate_limited_statsd
+        return SafeStatsdLogger(statsd, allow_list_validator, buffered_clients=buffered_clients)
 
     @classmethod
     def get_dogstatsd_logger(cls):
         """Get DataDog statsd logger"""
         from datadog import DogStatsd
-        dogstatsd = DogStatsd(
+        dogstatsd_parameters = inspect.signature(DogStatsd).parameters
+        optional_kwargs = {}
+        socket_path = conf.get('scheduler', 'statsd_socket_path', fallback=None)
+        if socket_path:
+            if 'socket_path' in dogstatsd_parameters:
+                optional_kwargs['socket_path'] = socket_path
+            else:
+                log.warning("Unix sockets require a newer datadog version, using host and port instead.")
+        buffering = False
+        if conf.getboolean('scheduler', 'statsd_batching_enabled', fallback=False):
+            # DogStatsd buffers the metrics and flushes them from its own thread since datadog 0.43.0
+            if 'disable_buffering' in dogstatsd_parameters:
+                buffering = True
+                optional_kwargs['disable_buffering'] = False
+                optional_kwargs['flush_interval'] = cls.get_flush_interval()
+            else:
+                log.warning("Batching metrics requires datadog>=0.43.0, sending them one by one instead.")
+        dogstatsd_kwargs = dict(
             host=conf.get('scheduler', 'statsd_host'),
             port=conf.getint('scheduler', 'statsd_port'),
             namespace=conf.get('scheduler', 'statsd_prefix'),
-            constant_tags=cls.get_constant_tags())
+            constant_tags=cls.get_constant_tags(),
+            **optional_kwargs)
         dogstatsd_allow_list = conf.get('scheduler', 'statsd_allow_list', fallback=None)
         allow_list_validator = AllowListValidator(dogstatsd_allow_list)
-        return SafeDogStatsdLogger(dogstatsd, allow_list_validator)
+        stats_logger = SafeDogStatsdLogger(DogStatsd(**dogstatsd_kwargs), allow_list_validator)
+        if buffering:
+            def flush():
+                stats_logger.dogstatsd.flush()
+
+            def after_fork_in_child():
+                # The flush thread of DogStatsd does not survive a fork and its buffer holds the stats
+                # of the parent process, so forked processes send their stats with a new client
+                stats_logger.set_client(DogStatsd(**dogstatsd_kwargs))
+
+            atexit.register(flush)
+            if hasattr(os, 'register_at_fork'):
+                os.register_at_fork(after_in_child=after_fork_in_child)  # pylint: disable=no-member
+        return stats_logger
+
+    @classmethod
+    def get_flush_interval(cls):
+        """Get the interval between flushes of the buffered stats, in seconds"""
+        flush_interval = conf.getfloat('scheduler', 'statsd_flush_interval', fallback=1.0)
+        if flush_interval <= 0:
+            raise AirflowConfigException(
+                "statsd_flush_interval must be greater than 0, got {}.".format(flush_interval)
+            )
+        return flush_interval
 
     @classmethod
     def get_constant_tags(cls):
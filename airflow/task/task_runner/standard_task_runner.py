@@ -57,6 +57,7 @@ class StandardTaskRunner(BaseTaskRunner):
             from airflow import settings
             from airflow.cli.cli_parser import get_parser
             from airflow.sentry import Sentry
+            from airflow.stats import Stats
 
             signal.signal(signal.SIGINT, signal.SIG_DFL)
             signal.signal(signal.SIGTERM, signal.SIG_DFL)
@@ -89,6 +90,8 @@ class StandardTaskRunner(BaseTaskRunner):
             finally:
                 # Explicitly flush any pending exception to Sentry if enabled
                 Sentry.flush()
+                # os._exit skips the exit handlers sending the buffered stats
+                Stats.flush()
                 os._exit(return_code)  # pylint: disable=protected-access
 
     def return_code(self, timeout=0):
@@ -0,0 +1,70 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import socket
+
+from statsd.client.base import PipelineBase, StatsClientBase
+
+
+class UnixDatagramStatsClient(StatsClientBase):
+    """
+    Statsd client sending the stats as datagrams over a Unix domain socket instead of UDP.
+
+    This only reaches a daemon on the same host, but skips the IP/UDP stack and allows
+    larger packets than the network MTU. The socket is non-blocking, so stats are dropped
+    rather than blocking the caller when the daemon does not keep up.
+    """
+
+    def __init__(self, socket_path, prefix=None, max_datagram_size=8192):
+        self.socket_path = socket_path
+        self.max_datagram_size = max_datagram_size
+        # Read by StatsClientBase and PipelineBase to prefix the stats
+        self._prefix = prefix
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+
+    def _send(self, data):
+        try:
+            self._sock.sendto(data.encode('ascii'), self.socket_path)
+        except (OSError, RuntimeError):
+            pass
+
+    def close(self):
+        """Close the socket"""
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = None
+
+    def pipeline(self):
+        """Returns a pipeline sending its stats in as few datagrams as possible"""
+        return UnixDatagramPipeline(self)
+
+
+class UnixDatagramPipeline(PipelineBase):
+    """Pipeline of UnixDatagramStatsClient"""
+
+    def _send(self):
+        max_datagram_size = self._client.max_datagram_size
+        data = self._stats.popleft()
+        while self._stats:
+            stat = self._stats.popleft()
+            if len(data) + len(stat) + 1 >= max_datagram_size:
+                self._client._after(data)  # pylint: disable=protected-access
+                data = stat
+            else:
+                data += '\n' + stat
+        self._client._after(data)  # pylint: disable=protected-access
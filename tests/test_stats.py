@@ -15,8 +15,11 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import _thread
 import importlib
 import re
+import threading
+import time
 import unittest
 from unittest import mock
 from unittest.mock import Mock
@@ -25,7 +28,10 @@ import statsd
 
 import airflow
 from airflow.exceptions import AirflowConfigException, InvalidStatsNameException
-from airflow.stats import AllowListValidator, SafeDogStatsdLogger, SafeStatsdLogger
+from airflow.stats import (
+    AggregatingStatsClient, AllowListValidator, BatchingStatsClient, DummyStatsLogger, RateLimitedStatsClient,
+    SafeDogStatsdLogger, SafeStatsdLogger,
+)
 from tests.test_utils.config import conf_vars
 
 
@@ -85,6 +91,32 @@ class TestStats(unittest.TestCase):
         self.stats.incr('test/$tats')
         self.statsd_client.assert_not_called()
 
+    def test_invalid_stat_name_error_is_not_chained(self):
+        for stat in ('test/$tats', []):
+            with self.assertLogs('airflow.stats', level='ERROR') as logs:
+                self.stats.incr(stat)
+            error = logs.records[0].exc_info[1]
+            assert isinstance(error, InvalidStatsNameException)
+            assert error.__context__ is None
+
+    def test_stat_name_must_only_include_ascii_characters(self):
+        self.stats.incr('test_st\u00e4ts')
+        self.statsd_client.incr.assert_not_called()
+
+    def test_stat_names_are_resolved_once(self):
+        handler = Mock(side_effect=lambda stat_name: stat_name.upper())
+        stats = SafeStatsdLogger(self.statsd_client, stat_name_handler=handler)
+        for _ in range(3):
+            stats.incr('test_stats_run')
+        handler.assert_called_once_with('test_stats_run')
+        assert self.statsd_client.incr.call_args_list == [mock.call('TEST_STATS_RUN', 1, 1)] * 3
+
+    def test_cached_stat_names_are_bounded(self):
+        with mock.patch.object(airflow.stats, 'MAX_CACHED_STAT_NAMES', 2):
+            for stat in ('stats_one', 'stats_two', 'stats_three'):
+                self.stats.incr(stat)
+        assert self.stats._stat_names == {'stats_three': 'stats_three'}
+
     @conf_vars({
         ('scheduler', 'statsd_on'): 'True'
     })
@@ -120,6 +152,33 @@ class TestStats(unittest.TestCase):
         airflow.stats.Stats.incr("dummy_key")
         assert CustomStatsd.incr_calls == 1
 
+    def test_resolved_attributes_are_stored_on_stats_class(self):
+        importlib.reload(airflow.stats)
+        assert 'incr' not in vars(airflow.stats.Stats)
+        airflow.stats.Stats.incr("dummy_key")
+        assert vars(airflow.stats.Stats)['incr'] == airflow.stats._Stats.instance.incr
+
+    @conf_vars({
+        ("scheduler", "statsd_on"): "True",
+        ("scheduler", "statsd_socket_path"): "/tmp/statsd.sock",
+    })
+    def test_load_unix_socket_statsd_client(self):
+        from airflow.utils.statsd_unix_socket import UnixDatagramStatsClient
+
+        importlib.reload(airflow.stats)
+        assert isinstance(airflow.stats.Stats.statsd, UnixDatagramStatsClient)
+
+    @conf_vars({
+        ("scheduler", "statsd_on"): "True",
+        ("scheduler", "statsd_socket_path"): "/tmp/statsd.sock",
+        ("scheduler", "statsd_custom_client_path"): "tests.test_stats.CustomStatsd",
+    })
+    def test_unix_socket_is_not_used_by_custom_statsd_client(self):
+        with self.assertLogs('airflow.stats', level='WARNING') as logs:
+            importlib.reload(airflow.stats)
+        assert isinstance(airflow.stats.Stats.statsd, CustomStatsd)
+        assert 'do not support Unix sockets' in logs.output[-1]
+
     @conf_vars({
         ("scheduler", "statsd_on"): "True",
         ("scheduler", "statsd_custom_client_path"): "tests.test_stats.InvalidCustomStatsd",
@@ -139,6 +198,339 @@ class TestStats(unittest.TestCase):
         importlib.reload(airflow.stats)
 
 
+class TestDummyStatsLogger(unittest.TestCase):
+
+    def test_methods_accept_stats_logger_arguments(self):
+        stats = DummyStatsLogger()
+        assert stats.incr('test_stats_run', 1, 1) is None
+        assert stats.decr('test_stats_run', count=1, rate=1) is None
+        assert stats.gauge('test_stats_gauge', 5, rate=1, delta=True) is None
+        assert stats.timing('test_stats_timing', 10) is None
+        assert stats.flush() is None
+
+
+def close_flushing_clients(stats):
+    """Stops the flusher threads of the test client and of the clients configured in Stats"""
+    stats.statsd.close()
+    for configured in getattr(airflow.stats.Stats.instance, 'buffered_clients', []):
+        configured.close()
+
+
+class TestBatchingStatsClient(unittest.TestCase):
+
+    def setUp(self):
+        self.statsd_client = Mock()
+        self.pipeline = self.statsd_client.pipeline.return_value
+        self.stats = SafeStatsdLogger(BatchingStatsClient(self.statsd_client, flush_interval=3600))
+
+    def test_stats_are_queued_until_flush(self):
+        self.stats.incr('test_stats_run')
+        self.stats.gauge('test_stats_gauge', 5)
+        self.statsd_client.incr.assert_not_called()
+        self.pipeline.incr.assert_not_called()
+
+        self.stats.statsd.flush()
+        self.pipeline.incr.assert_called_once_with('test_stats_run', 1, 1)
+        self.pipeline.gauge.assert_called_once_with('test_stats_gauge', 5, 1, False)
+        self.pipeline.send.assert_called_once_with()
+
+    def test_oldest_stats_are_dropped_when_queue_is_full(self):
+        client = BatchingStatsClient(self.statsd_client, flush_interval=3600, max_queue_size=2)
+        wakeup, client._wakeup = client._wakeup, Mock()  # keep the flusher thread asleep
+        self.addCleanup(client.close)
+        self.addCleanup(setattr, client, '_wakeup', wakeup)
+        for stat in ('stats_one', 'stats_two', 'stats_three'):
+            client.incr(stat)
+        client.flush()
+        assert self.pipeline.incr.call_args_list == [
+            mock.call('stats.dropped', 1),
+            mock.call('stats_two', 1, 1),
+            mock.call('stats_three', 1, 1),
+        ]
+
+    def test_flusher_is_woken_up_once_when_queue_fills_up(self):
+        client = BatchingStatsClient(self.statsd_client, flush_interval=3600, max_queue_size=2)
+        wakeup, client._wakeup = client._wakeup, Mock(wraps=threading.Event())
+        self.addCleanup(client.close)
+        self.addCleanup(setattr, client, '_wakeup', wakeup)
+        with mock.patch.object(client, 'flush'):
+            for stat in ('stats_one', 'stats_two', 'stats_three', 'stats_four'):
+                client.incr(stat)
+        client._wakeup.set.assert_called_once_with()
+
+    def test_flusher_thread_survives_failed_flush(self):
+        failures = [OSError("send failed")]
+
+        def send():
+            if failures:
+                raise failures.pop()
+
+        self.pipeline.send.side_effect = send
+        client = BatchingStatsClient(self.statsd_client, flush_interval=0.01)
+        self.addCleanup(client.close)
+        with self.assertLogs('airflow.stats', level='ERROR') as logs:
+            client.incr('stats_one')
+            deadline = time.monotonic() + 5
+            while not logs.records and time.monotonic() < deadline:
+                time.sleep(0.01)
+            client.incr('stats_two')
+            while self.pipeline.send.call_count < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert 'Could not send the buffered stats' in logs.output[0]
+        self.pipeline.incr.assert_called_with('stats_two', 1, 1)
+        assert self.pipeline.send.call_count >= 2
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+        ('scheduler', 'statsd_flush_interval'): '0',
+    })
+    def test_flush_interval_must_be_positive(self):
+        with self.assertRaisesRegex(AirflowConfigException, 'statsd_flush_interval must be greater than 0'):
+            importlib.reload(airflow.stats)
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_flush_interval'): '0',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_flush_interval_is_not_checked_without_buffering(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        airflow.stats.Stats.incr("dummy_key")
+        mock_statsd.return_value.incr.assert_called_once_with('dummy_key', 1, 1)
+
+    def test_forked_client_drops_parent_stats_and_restarts(self):
+        self.stats.incr('test_stats_run')
+        with mock.patch.object(threading.Thread, 'start') as start_thread:
+            self.stats.statsd._after_fork()
+        start_thread.assert_called_once_with()
+        self.stats.statsd.flush()
+        self.pipeline.incr.assert_not_called()
+
+    def test_closed_client_does_not_restart_after_fork(self):
+        self.stats.statsd.close()
+        with mock.patch.object(threading.Thread, 'start') as start_thread:
+            self.stats.statsd._after_fork()
+        start_thread.assert_not_called()
+        assert self.stats.statsd._closed
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_batching_enabled_by_config(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        airflow.stats.Stats.incr("dummy_key")
+        airflow.stats.Stats.flush()
+        mock_statsd.return_value.pipeline.return_value.incr.assert_called_once_with('dummy_key', 1, 1)
+        mock_statsd.return_value.incr.assert_not_called()
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+        ('scheduler', 'statsd_allow_list'): 'dummy',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_dropped_stats_are_not_reported_when_not_allowed(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        client = airflow.stats.Stats.statsd
+        assert not client.report_dropped
+        client._dropped = 1
+        client.flush()
+        mock_statsd.return_value.pipeline.return_value.incr.assert_not_called()
+
+    def tearDown(self) -> None:
+        close_flushing_clients(self.stats)
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
+class TestAggregatingStatsClient(unittest.TestCase):
+
+    def setUp(self):
+        self.statsd_client = Mock()
+        self.stats = SafeStatsdLogger(AggregatingStatsClient(self.statsd_client, flush_interval=3600))
+
+    def test_counters_are_summed_up_until_flush(self):
+        self.stats.incr('test_stats_run')
+        self.stats.incr('test_stats_run', 3)
+        self.stats.decr('test_stats_run')
+        self.statsd_client.incr.assert_not_called()
+
+        self.stats.statsd.close()
+        self.statsd_client.incr.assert_called_once_with('test_stats_run', 3)
+
+    def test_counters_are_summed_up_across_threads(self):
+        threads = [threading.Thread(target=self.stats.incr, args=('test_stats_run',)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.stats.incr('test_stats_run')
+
+        self.stats.statsd.close()
+        assert sum(call[0][1] for call in self.statsd_client.incr.call_args_list) == 6
+
+    def test_shards_of_idle_threads_are_detached(self):
+        client = self.stats.statsd
+        done = threading.Semaphore(0)
+
+        def work():
+            self.stats.incr('test_stats_run')
+            done.release()
+
+        # Threads not started by the threading module are always seen as alive
+        for _ in range(5):
+            _thread.start_new_thread(work, ())
+        for _ in range(5):
+            done.acquire()
+        for _ in range(4):
+            client.flush()
+        assert client._shards == []
+        assert sum(call[0][1] for call in self.statsd_client.incr.call_args_list) == 5
+
+        self.stats.incr('test_stats_run')
+        client.close()
+        assert sum(call[0][1] for call in self.statsd_client.incr.call_args_list) == 6
+
+    def test_gauges_send_last_value(self):
+        self.stats.gauge('test_stats_gauge', 5)
+        self.stats.gauge('test_stats_gauge', 2)
+        self.stats.gauge('test_stats_gauge', 3, delta=True)
+        self.stats.gauge('test_stats_delta', 1, delta=True)
+        self.stats.gauge('test_stats_delta', 1, delta=True)
+
+        self.stats.statsd.flush()
+        assert self.statsd_client.gauge.call_args_list == [
+            mock.call('test_stats_gauge', 5),
+            mock.call('test_stats_delta', 2.0, delta=True),
+        ]
+
+    def test_timings_and_sampled_stats_are_sent_directly(self):
+        self.stats.timing('test_stats_timing', 10)
+        self.stats.incr('test_stats_run', rate=0.5)
+        self.statsd_client.timing.assert_called_once_with('test_stats_timing', 10)
+        self.statsd_client.incr.assert_called_once_with('test_stats_run', 1, 0.5)
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_aggregation_enabled'): 'True',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_aggregation_enabled_by_config(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        airflow.stats.Stats.incr("dummy_key")
+        airflow.stats.Stats.incr("dummy_key")
+        airflow.stats.Stats.flush()
+        mock_statsd.return_value.incr.assert_called_once_with('dummy_key', 2)
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_aggregation_enabled'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_flush_sends_aggregated_stats_through_batching(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        airflow.stats.Stats.incr("dummy_key")
+        airflow.stats.Stats.flush()
+        mock_statsd.return_value.pipeline.return_value.incr.assert_called_once_with('dummy_key', 1, 1)
+
+    def tearDown(self) -> None:
+        close_flushing_clients(self.stats)
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
+class TestRateLimitedStatsClient(unittest.TestCase):
+
+    def setUp(self):
+        self.statsd_client = Mock()
+        self.stats = SafeStatsdLogger(RateLimitedStatsClient(self.statsd_client, max_rate=2))
+
+    @mock.patch("time.monotonic")
+    def test_stats_over_rate_limit_are_sampled(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(4):
+            self.stats.incr('test_stats_run')
+        mock_monotonic.return_value = 101
+        self.stats.incr('test_stats_run')
+        assert self.statsd_client.incr.call_args_list == [
+            mock.call('test_stats_run', 1, 1.0),
+            mock.call('test_stats_run', 1, 1.0),
+            mock.call('test_stats_run', 1, 2 / 3),
+            mock.call('test_stats_run', 1, 0.5),
+            mock.call('test_stats_run', 1, 0.5),
+        ]
+
+    @mock.patch("time.monotonic")
+    def test_bursts_are_sampled(self, mock_monotonic):
+        stats = SafeStatsdLogger(RateLimitedStatsClient(self.statsd_client, max_rate=10))
+        for burst in range(5):
+            self.statsd_client.reset_mock()
+            mock_monotonic.return_value = 100 + burst * 2.5
+            for _ in range(1000):
+                stats.incr('test_stats_run')
+            sample_rates = [call[0][2] for call in self.statsd_client.incr.call_args_list]
+            assert sample_rates[:10] == [1.0] * 10
+            assert sample_rates[-1] == 0.01
+            # The expected number of stats sent is the sum of their sample rates
+            assert sum(sample_rates) < 60
+
+    @mock.patch("time.monotonic")
+    def test_sample_rate_is_reset_after_idle_second(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(4):
+            self.stats.timing('test_stats_timing', 10)
+        mock_monotonic.return_value = 102
+        self.stats.timing('test_stats_timing', 10)
+        assert self.statsd_client.timing.call_args_list == [
+            mock.call('test_stats_timing', 10),
+            mock.call('test_stats_timing', 10),
+            mock.call('test_stats_timing', 10, 2 / 3),
+            mock.call('test_stats_timing', 10, 0.5),
+            mock.call('test_stats_timing', 10),
+        ]
+
+    def test_gauge_deltas_are_not_sampled(self):
+        for _ in range(4):
+            self.stats.gauge('test_stats_gauge', 1, delta=True)
+        assert self.statsd_client.gauge.call_args_list == [mock.call('test_stats_gauge', 1, 1, True)] * 4
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_rate_limit'): '10',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_rate_limit_enabled_by_config(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        assert isinstance(airflow.stats.Stats.statsd, airflow.stats.RateLimitedStatsClient)
+        assert airflow.stats.Stats.statsd.max_rate == 10
+
+    @conf_vars({
+        ('scheduler', 'statsd_on'): 'True',
+        ('scheduler', 'statsd_rate_limit'): '1',
+        ('scheduler', 'statsd_aggregation_enabled'): 'True',
+    })
+    @mock.patch("statsd.StatsClient")
+    def test_aggregated_stats_are_not_rate_limited(self, mock_statsd):
+        importlib.reload(airflow.stats)
+        client = airflow.stats.Stats.statsd
+        assert isinstance(client.passthrough, airflow.stats.RateLimitedStatsClient)
+        for _ in range(3):
+            airflow.stats.Stats.incr("dummy_key")
+            airflow.stats.Stats.gauge("dummy_gauge", 5)
+            client.flush()
+        client.close()
+        assert mock_statsd.return_value.incr.call_args_list == [mock.call('dummy_key', 1)] * 3
+        assert mock_statsd.return_value.gauge.call_args_list == [mock.call('dummy_gauge', 5)] * 3
+
+    def tearDown(self) -> None:
+        # To avoid side-effect
+        importlib.reload(airflow.stats)
+
+
 class TestDogStats(unittest.TestCase):
 
     def setUp(self):
@@ -148,7 +540,7 @@ class TestDogStats(unittest.TestCase):
     def test_increment_counter_with_valid_name_with_dogstatsd(self):
         self.dogstatsd.incr('test_stats_run')
         self.dogstatsd_client.increment.assert_called_once_with(
-            metric='test_stats_run', sample_rate=1, tags=[], value=1
+            'test_stats_run', 1, None, 1
         )
 
     def test_stat_name_must_be_a_string_with_dogstatsd(self):
@@ -171,7 +563,7 @@ class TestDogStats(unittest.TestCase):
         importlib.reload(airflow.stats)
         airflow.stats.Stats.incr("dummy_key")
         mock_dogstatsd.return_value.increment.assert_called_once_with(
-            metric='dummy_key', sample_rate=1, tags=[], value=1
+            'dummy_key', 1, None, 1
         )
 
     @conf_vars({
@@ -182,9 +574,82 @@ class TestDogStats(unittest.TestCase):
         importlib.reload(airflow.stats)
         airflow.stats.Stats.incr("dummy_key", 1, 1, ['key1:value1', 'key2:value2'])
         mock_dogstatsd.return_value.increment.assert_called_once_with(
-            metric='dummy_key', sample_rate=1, tags=['key1:value1', 'key2:value2'], value=1
+            'dummy_key', 1, ['key1:value1', 'key2:value2'], 1
         )
 
+    @conf_vars({
+        ('scheduler', 'statsd_datadog_enabled'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+        ('scheduler', 'statsd_flush_interval'): '0.5',
+    })
+    @mock.patch("datadog.DogStatsd", autospec=True)
+    def test_batching_enables_dogstatsd_buffering(self, mock_dogstatsd):
+        importlib.reload(airflow.stats)
+        _, kwargs = mock_dogstatsd.call_args
+        assert kwargs['disable_buffering'] is False
+        assert kwargs['flush_interval'] == 0.5
+
+    @conf_vars({
+        ('scheduler', 'statsd_datadog_enabled'): 'True',
+        ('scheduler', 'statsd_batching_enabled'): 'True',
+    })
+    @mock.patch("os.register_at_fork", create=True)
+    @mock.patch("datadog.DogStatsd", autospec=True)
+    def test_forked_process_sends_buffered_stats_with_new_client(self, mock_dogstatsd, mock_register_at_fork):
+        parent_client, child_client = Mock(), Mock()
+        mock_dogstatsd.side_effect = [parent_client, child_client]
+        importlib.reload(airflow.stats)
+        airflow.stats.Stats.incr("dummy_key")
+        _, kwargs = mock_register_at_fork.call_args
+        kwargs['after_in_child']()
+
+        airflow.stats.Stats.incr("dummy_key")
+        assert mock_dogstatsd.call_args_list[0] == mock_dogstatsd.call_args_list[1]
+        parent_client.increment.assert_called_once_with('dummy_key', 1, None, 1)
+        child_client.increment.assert_called_once_with('dummy_key', 1, None, 1)
+
+    @conf_vars({
+        ('scheduler', 'statsd_datadog_enabled'): 'True',
+    })
+    @mock.patch("datadog.DogStatsd", autospec=True)
+    def test_dogstatsd_without_socket_path(self, mock_dogstatsd):
+        importlib.reload(airflow.stats)
+        _, kwargs = mock_dogstatsd.call_args
+        assert 'socket_path' not in kwargs
+
+    @conf_vars({
+        ('scheduler', 'statsd_datadog_enabled'): 'True',
+        ('scheduler', 'statsd_socket_path'): '/tmp/statsd.sock',
+    })
+    @mock.patch("datadog.DogStatsd", autospec=True)
+    def test_dogstatsd_with_socket_path(self, mock_dogstatsd):
+        importlib.reload(airflow.stats)
+        _, kwargs = mock_dogstatsd.call_args
+        assert kwargs['socket_path'] == '/tmp/statsd.sock'
+
+    @conf_vars({
+        ('scheduler', 'statsd_datadog_enabled'): 'True',
+        ('scheduler', 'statsd_socket_path'): '/tmp/statsd.sock',
+    })
+    def test_dogstatsd_socket_path_is_not_passed_to_old_datadog_versions(self):
+        class OldDogStatsd:
+            def __init__(self, host='localhost', port=8125, namespace=None, constant_tags=None):
+                pass
+
+            def increment(self, metric, value=1, tags=None, sample_rate=None):
+                pass
+
+            def gauge(self, metric, value, tags=None, sample_rate=None):
+                pass
+
+            decrement = increment
+            timing = gauge
+
+        with mock.patch("datadog.DogStatsd", mock.create_autospec(OldDogStatsd)) as mock_dogstatsd:
+            importlib.reload(airflow.stats)
+        _, kwargs = mock_dogstatsd.call_args
+        assert 'socket_path' not in kwargs
+
     @conf_vars({
         ('scheduler', 'statsd_on'): 'True',
         ('scheduler', 'statsd_datadog_enabled'): 'True'
@@ -194,7 +659,7 @@ class TestDogStats(unittest.TestCase):
         importlib.reload(airflow.stats)
         airflow.stats.Stats.incr("dummy_key")
         mock_dogstatsd.return_value.increment.assert_called_once_with(
-            metric='dummy_key', sample_rate=1, tags=[], value=1
+            'dummy_key', 1, None, 1
         )
 
     @conf_vars({
@@ -230,6 +695,30 @@ class TestStatsWithAllowList(unittest.TestCase):
         self.stats.incr('stats_three')
         self.statsd_client.assert_not_called()
 
+    def test_allow_list_is_case_insensitive(self):
+        self.stats.incr('STATS_two.bla')
+        self.statsd_client.incr.assert_called_once_with('STATS_two.bla', 1, 1)
+
+    def test_allow_list_entries_are_case_insensitive(self):
+        validator = AllowListValidator(" Stats_One ")
+        assert validator.test('stats_one.bla')
+        assert validator.test('STATS_ONE.bla')
+        assert not validator.test('stats_two')
+        assert not validator.test('STATS_TWO')
+
+    def test_allow_list_prefixes_starting_with_other_prefixes(self):
+        validator = AllowListValidator("stats, stats_one.a, stats_one, stats_two.a, zzz")
+        assert validator.test('stats_one.b')
+        assert validator.test('stats_two.b')
+        assert validator.test('zzz')
+        assert not validator.test('stat')
+        assert not validator.test('aaa')
+
+    def test_allow_list_prefixes_are_matched_literally(self):
+        validator = AllowListValidator("stats.one")
+        assert validator.test('stats.one.bla')
+        assert not validator.test('stats_one')
+
 
 class TestDogStatsWithAllowList(unittest.TestCase):
 
@@ -240,13 +729,13 @@ class TestDogStatsWithAllowList(unittest.TestCase):
     def test_increment_counter_with_allowed_key(self):
         self.dogstats.incr('stats_one')
         self.dogstatsd_client.increment.assert_called_once_with(
-            metric='stats_one', sample_rate=1, tags=[], value=1
+            'stats_one', 1, None, 1
         )
 
     def test_increment_counter_with_allowed_prefix(self):
         self.dogstats.incr('stats_two.bla')
         self.dogstatsd_client.increment.assert_called_once_with(
-            metric='stats_two.bla', sample_rate=1, tags=[], value=1
+            'stats_two.bla', 1, None, 1
         )
 
     def test_not_increment_counter_if_not_allowed(self):
@@ -302,9 +791,20 @@ class TestCustomStatsName(unittest.TestCase):
         importlib.reload(airflow.stats)
         airflow.stats.Stats.incr("dummy_key")
         mock_dogstatsd.return_value.increment.assert_called_once_with(
-            metric='dummy_key', sample_rate=1, tags=[], value=1
+            'dummy_key', 1, None, 1
         )
 
+    @conf_vars({
+        ('scheduler', 'stat_name_handler'): 'tests.test_stats.always_valid'
+    })
+    def test_stat_name_handler_is_resolved_once(self):
+        importlib.reload(airflow.stats)
+        conf = airflow.stats.conf
+        with mock.patch.object(conf, 'getimport', wraps=conf.getimport) as getimport:
+            assert airflow.stats.get_current_handler_stat_name_func() is always_valid
+            assert airflow.stats.get_current_handler_stat_name_func() is always_valid
+        getimport.assert_called_once_with('scheduler', 'stat_name_handler')
+
     def tearDown(self) -> None:
         # To avoid side-effect
         importlib.reload(airflow.stats)
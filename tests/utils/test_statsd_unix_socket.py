@@ -0,0 +1,61 @@
+#
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import socket
+import unittest
+from tempfile import TemporaryDirectory
+
+from airflow.utils.statsd_unix_socket import UnixDatagramStatsClient
+
+
+class TestUnixDatagramStatsClient(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp_dir.name, 'statsd.sock')
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.server.bind(self.socket_path)
+        self.server.settimeout(5)
+
+    def tearDown(self):
+        self.server.close()
+        self.tmp_dir.cleanup()
+
+    def test_sends_stats_to_socket(self):
+        client = UnixDatagramStatsClient(self.socket_path, prefix='airflow')
+        client.incr('test_stats_run')
+        assert self.server.recv(1024) == b'airflow.test_stats_run:1|c'
+
+    def test_sends_pipeline_in_one_datagram(self):
+        client = UnixDatagramStatsClient(self.socket_path)
+        with client.pipeline() as pipeline:
+            pipeline.incr('test_stats_run')
+            pipeline.gauge('test_stats_gauge', 5)
+        assert self.server.recv(1024) == b'test_stats_run:1|c\ntest_stats_gauge:5|g'
+
+    def test_splits_pipeline_over_max_datagram_size(self):
+        client = UnixDatagramStatsClient(self.socket_path, max_datagram_size=20)
+        with client.pipeline() as pipeline:
+            pipeline.incr('test_stats_run')
+            pipeline.gauge('test_stats_gauge', 5)
+        assert self.server.recv(1024) == b'test_stats_run:1|c'
+        assert self.server.recv(1024) == b'test_stats_gauge:5|g'
+
+    def test_does_not_raise_without_listener(self):
+        client = UnixDatagramStatsClient(os.path.join(self.tmp_dir.name, 'missing.sock'))
+        client.incr('test_stats_run')